@@ -1,59 +1,153 @@
 import os
-import csv
+import sys
+import hmac
+import time
+import atexit
 import hashlib
-from datetime import datetime
+
+try:
+    import readline  # noqa: F401  line editing and history for input(); not available on Windows
+except ImportError:
+    pass
 
 # ===============================
 # File names used in the project
 # ===============================
 ACCOUNTS_FILE = "accounts.txt"       # Stores account details
 TRANSACTIONS_FILE = "transactions.txt"  # Stores transaction logs
+BALANCE_WIDTH = 15  # Minimum width of the balance field so most updates keep the row length
+TXN_BATCH_SIZE = 32  # Number of buffered transactions written to disk at once
+PBKDF2_ITERATIONS = 100_000  # Key-derivation rounds used when hashing passwords
+
+MAIN_MENU = (
+    "\n===== Banking System =====\n"
+    "1. Create Account\n"
+    "2. Login\n"
+    "3. Exit\n"
+)
+ACCOUNT_MENU = (
+    "\n===== Account Menu =====\n"
+    "1. Deposit\n"
+    "2. Withdraw\n"
+    "3. Balance Inquiry\n"
+    "4. Fund Transfer\n"
+    "5. Change Password\n"
+    "6. Close Account\n"
+    "7. Logout\n"
+)
+
+_SESSION_KEY = os.urandom(32)  # Per-process key for in-memory session password digests
+
+_txn_buffer = []  # Transactions waiting to be written to transactions.txt
+_txn_fd = None  # Long-lived append-only file descriptor for transactions.txt
 
 
 # ===============================
 # Utility Functions
 # ===============================
-def hash_password(password):
-    """Convert a plain password into a SHA-256 hash for security."""
+def hash_password(password, salt):
+    """Derive a salted PBKDF2-SHA256 hash of a plain password for security."""
+    return hashlib.pbkdf2_hmac("sha256", password.encode(), bytes.fromhex(salt), PBKDF2_ITERATIONS).hex()
+
+
+def session_digest(password, salt):
+    """Cheap keyed digest of a password already verified this session; never stored on disk."""
+    return hmac.new(_SESSION_KEY, f"{salt},{password}".encode(), "sha256").digest()
+
+
+def legacy_hash_password(password):
+    """Unsalted SHA-256 hash used by accounts created before salts were stored."""
     return hashlib.sha256(password.encode()).hexdigest()
 
 
+def generate_salt():
+    """Generate a random per-account salt as a hex string."""
+    return os.urandom(16).hex()
+
+
 def generate_account_number():
     """Generate unique account number by checking last account in accounts.txt"""
     if not os.path.exists(ACCOUNTS_FILE) or os.stat(ACCOUNTS_FILE).st_size == 0:
         return 100001  # first account number
     else:
-        with open(ACCOUNTS_FILE, "r") as f:
-            lines = f.readlines()
-            last_account = int(lines[-1].split(",")[0])  # take last account number
+        with open(ACCOUNTS_FILE, "rb") as f:
+            # Read only the end of the file instead of every line
+            f.seek(0, 2)
+            size = f.tell()
+            f.seek(size - min(size, 512))
+            tail = f.read().rstrip()
+            newline = tail.rfind(b"\n")
+            if newline == -1 and size > 512:
+                f.seek(0)  # last line is longer than the tail; fall back to a full read
+                tail = f.read().rstrip()
+                newline = tail.rfind(b"\n")
+            last_account = int(tail[newline + 1:].split(b",")[0])  # take last account number
             return last_account + 1
 
 
+def read_amount(prompt):
+    """Read a money amount; amounts finer than a cent are rejected, since balances keep 2 decimals."""
+    amount = float(input(prompt))
+    if round(amount, 2) != amount:
+        print("❌ Amount can have at most 2 decimal places.")
+        return None
+    return amount
+
+
+def current_timestamp():
+    """Format the current local time like str(datetime.now()) without building a datetime."""
+    seconds, nanos = divmod(time.time_ns(), 1_000_000_000)
+    return f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(seconds))}.{nanos // 1000:06d}"
+
+
 def log_transaction(account_no, txn_type, amount, target_account=None):
-    """Record a transaction in transactions.txt with timestamp."""
-    with open(TRANSACTIONS_FILE, "a", newline='') as f:
-        writer = csv.writer(f)
-        if target_account:  # if transfer, log with target account
-            writer.writerow([account_no, f"{txn_type} to {target_account}", amount, datetime.now()])
-        else:  # deposit/withdraw
-            writer.writerow([account_no, txn_type, amount, datetime.now()])
+    """Queue a transaction with timestamp; it is written to transactions.txt in batches."""
+    if target_account:  # if transfer, log with target account
+        txn_type = f"{txn_type} to {target_account}"
+    # Rows never contain commas, so they are formatted directly (with csv's \r\n ending)
+    _txn_buffer.append(f"{account_no},{txn_type},{amount},{current_timestamp()}\r\n")
+    if len(_txn_buffer) >= TXN_BATCH_SIZE:
+        flush_transactions()
+
+
+def flush_transactions():
+    """Write all queued transactions to transactions.txt and sync them to disk."""
+    global _txn_fd
+    if not _txn_buffer:
+        return
+    if _txn_fd is None:
+        flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0)
+        _txn_fd = os.open(TRANSACTIONS_FILE, flags, 0o644)
+    os.write(_txn_fd, "".join(_txn_buffer).encode())
+    os.fsync(_txn_fd)
+    _txn_buffer.clear()
+
+
+atexit.register(flush_transactions)
+
+
+def format_account(acc):
+    """Format an account as a row of accounts.txt with a padded balance field."""
+    return f"{acc.account_no},{acc.name},{acc.password},{acc.balance:>{BALANCE_WIDTH}.2f},{acc.acc_type},{acc.salt}\n"
 
 
 # ===============================
 # Account Class
 # ===============================
 class Account:
-    def __init__(self, account_no, name, password, balance, acc_type):
+    def __init__(self, account_no, name, password, balance, acc_type, salt=""):
         """Initialize an account object."""
         self.account_no = account_no
         self.name = name
         self.password = password  # hashed password
-        self.balance = float(balance)
+        self.balance = round(float(balance), 2)  # balances are kept to 2 decimals, as on disk
         self.acc_type = acc_type
+        self.salt = salt  # empty for accounts still using the unsalted legacy hash
+        self.session_digest = None  # set while logged in, so re-checks skip the slow KDF
 
     def deposit(self, amount):
         """Deposit money into the account."""
-        self.balance += amount
+        self.balance = round(self.balance + amount, 2)
         log_transaction(self.account_no, "Deposit", amount)
 
     def withdraw(self, amount):
@@ -61,7 +155,7 @@ class Account:
         if amount > self.balance:
             print("❌ Insufficient balance.")
             return False
-        self.balance -= amount
+        self.balance = round(self.balance - amount, 2)
         log_transaction(self.account_no, "Withdrawal", amount)
         return True
 
@@ -71,9 +165,9 @@ class Account:
             print("❌ Insufficient balance for transfer.")
             return False
         # Deduct from sender
-        self.balance -= amount
+        self.balance = round(self.balance - amount, 2)
         # Add to receiver
-        target_account.balance += amount
+        target_account.balance = round(target_account.balance + amount, 2)
         # Log both transactions
         log_transaction(self.account_no, "Transfer", amount, target_account.account_no)
         log_transaction(target_account.account_no, "Received", amount, self.account_no)
@@ -91,6 +185,10 @@ class BankingSystem:
             if not os.path.exists(file):
                 with open(file, "w") as f:
                     pass  # create empty file
+        self.accounts = {}  # account_no -> Account
+        self.offsets = {}   # account_no -> byte offset of its row in accounts.txt
+        self.row_lengths = {}  # account_no -> byte length of its row, without the line ending
+        self.load_accounts()
 
     # ---------- Account Creation ----------
     def create_account(self):
@@ -98,14 +196,21 @@ class BankingSystem:
         name = input("Enter your name: ")
         password = input("Set a password: ")
         acc_type = input("Enter account type (Savings/Current): ")
-        deposit = float(input("Enter initial deposit: "))
+        deposit = read_amount("Enter initial deposit: ")
+        if deposit is None:
+            return
 
-        account_no = generate_account_number()
-        hashed_password = hash_password(password)
+        account_no = str(generate_account_number())
+        salt = generate_salt()
+        account = Account(account_no, name, hash_password(password, salt), deposit, acc_type, salt)
 
-        # Save to accounts.txt
-        with open(ACCOUNTS_FILE, "a") as f:
-            f.write(f"{account_no},{name},{hashed_password},{deposit},{acc_type}\n")
+        # Save to accounts.txt as UTF-8 bytes, matching save_accounts and persist_accounts
+        row = format_account(account).encode()
+        with open(ACCOUNTS_FILE, "ab") as f:
+            self.offsets[account_no] = f.tell()
+            f.write(row)
+        self.row_lengths[account_no] = len(row) - 1  # without the newline
+        self.accounts[account_no] = account
 
         print(f"✅ Account created successfully! Your account number is {account_no}")
 
@@ -114,57 +219,109 @@ class BankingSystem:
         """Login to an existing account."""
         acc_no = input("Enter account number: ")
         password = input("Enter password: ")
-        hashed_password = hash_password(password)
 
-        with open(ACCOUNTS_FILE, "r") as f:
-            for line in f:
-                account_no, name, pwd, balance, acc_type = line.strip().split(",")
-                if account_no == acc_no and pwd == hashed_password:
-                    # Create an Account object for the logged-in user
-                    self.logged_in_account = Account(account_no, name, pwd, balance, acc_type)
-                    print(f"✅ Welcome {name}!")
-                    return True
+        # Find the account first so only its own hash is derived and compared
+        account = self.accounts.get(acc_no)
+        if account:
+            if account.salt:
+                hashed_password = hash_password(password, account.salt)
+            else:
+                hashed_password = legacy_hash_password(password)
+            if hmac.compare_digest(account.password, hashed_password):
+                if not account.salt:
+                    # Upgrade the legacy hash; the row grows, so rewrite the file once
+                    account.salt = generate_salt()
+                    account.password = hash_password(password, account.salt)
+                    self.save_accounts(self.accounts.values())
+                account.session_digest = session_digest(password, account.salt)
+                self.logged_in_account = account
+                print(f"✅ Welcome {account.name}!")
+                return True
 
         print("❌ Invalid account number or password.")
         return False
 
     # ---------- Helper Methods ----------
+    def load_accounts(self):
+        """Read accounts.txt once into the in-memory index, recording each row's offset"""
+        normalized = True
+        offset = 0
+        # Binary mode lets offsets be summed from line lengths instead of calling tell()
+        with open(ACCOUNTS_FILE, "rb") as f:
+            for raw in f:
+                line = raw.decode().strip()
+                if line:
+                    # Rows without a trailing salt column predate salted hashes
+                    fields = line.split(",")
+                    account = Account(*fields)
+                    self.accounts[account.account_no] = account
+                    self.offsets[account.account_no] = offset
+                    self.row_lengths[account.account_no] = len(raw.rstrip(b"\r\n"))
+                    if len(fields[3]) < BALANCE_WIDTH:
+                        normalized = False
+                offset += len(raw)
+        # Older files store unpadded balances; rewrite them once in fixed-width form
+        if not normalized:
+            self.save_accounts(self.accounts.values())
+
     def save_accounts(self, accounts):
-        """Save all accounts back to accounts.txt"""
-        with open(ACCOUNTS_FILE, "w") as f:
-            for acc in accounts:
-                f.write(f"{acc.account_no},{acc.name},{acc.password},{acc.balance},{acc.acc_type}\n")
+        """Save all accounts back to accounts.txt and rebuild the offset index"""
+        offsets = {}
+        row_lengths = {}
+        rows = []
+        offset = 0
+        for acc in accounts:
+            row = format_account(acc).encode()
+            offsets[acc.account_no] = offset
+            row_lengths[acc.account_no] = len(row) - 1  # without the newline
+            rows.append(row)
+            offset += len(row)
+        # Write a temporary copy and swap it in so a crash never leaves a half-written file
+        tmp_file = ACCOUNTS_FILE + ".tmp"
+        with open(tmp_file, "wb") as f:
+            f.write(b"".join(rows))  # one write for the whole table
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, ACCOUNTS_FILE)
+        self.offsets = offsets
+        self.row_lengths = row_lengths
+
+    def persist_accounts(self, *accounts):
+        """Overwrite the given rows in place, or rewrite the file if a row changed length"""
+        rows = [format_account(acc).rstrip("\n").encode() for acc in accounts]
+        for acc, row in zip(accounts, rows):
+            if len(row) != self.row_lengths[acc.account_no]:
+                # The balance outgrew (or shrank back to) its padding; an in-place
+                # write would spill into the next row or leave stale bytes behind
+                self.save_accounts(self.accounts.values())
+                return
+        with open(ACCOUNTS_FILE, "r+b") as f:
+            for acc, row in zip(accounts, rows):
+                f.seek(self.offsets[acc.account_no])
+                f.write(row)
 
     def get_all_accounts(self):
-        """Read all accounts from accounts.txt into a list of Account objects"""
-        accounts = []
-        with open(ACCOUNTS_FILE, "r") as f:
-            for line in f:
-                if line.strip():
-                    account_no, name, pwd, balance, acc_type = line.strip().split(",")
-                    accounts.append(Account(account_no, name, pwd, balance, acc_type))
-        return accounts
+        """Return all accounts from the in-memory index"""
+        return self.accounts.values()
 
     def update_account(self):
         """Update the logged-in account details in accounts.txt"""
-        accounts = self.get_all_accounts()
-        for acc in accounts:
-            if acc.account_no == self.logged_in_account.account_no:
-                acc.balance = self.logged_in_account.balance
-        self.save_accounts(accounts)
+        self.persist_accounts(self.logged_in_account)
 
     # ---------- Transaction Operations ----------
     def deposit(self):
         """Deposit money into the logged-in account"""
-        amount = float(input("Enter deposit amount: "))
+        amount = read_amount("Enter deposit amount: ")
+        if amount is None:
+            return
         self.logged_in_account.deposit(amount)
         self.update_account()
         print("✅ Deposit successful!")
 
     def withdraw(self):
         """Withdraw money from the logged-in account"""
-        amount = float(input("Enter withdrawal amount: "))
-        if self.logged_in_account.withdraw(amount):
+        amount = read_amount("Enter withdrawal amount: ")
+        if amount is not None and self.logged_in_account.withdraw(amount):
             self.update_account()
             print("✅ Withdrawal successful!")
 
@@ -175,19 +332,16 @@ class BankingSystem:
     def transfer(self):
         """Transfer money from logged-in account to another account"""
         target_no = input("Enter target account number: ")
-        amount = float(input("Enter transfer amount: "))
+        amount = read_amount("Enter transfer amount: ")
+        if amount is None:
+            return
 
-        accounts = self.get_all_accounts()
-        target_account = None
-        for acc in accounts:
-            if acc.account_no == target_no:
-                target_account = acc
-                break
+        target_account = self.accounts.get(target_no)
 
         if target_account:
             if self.logged_in_account.transfer(target_account, amount):
-                self.update_account()
-                self.save_accounts(accounts)
+                # Both legs are written through a single open of accounts.txt
+                self.persist_accounts(self.logged_in_account, target_account)
                 print("✅ Transfer successful!")
         else:
             print("❌ Target account not found.")
@@ -195,18 +349,18 @@ class BankingSystem:
     # ---------- Password Management ----------
     def change_password(self):
         """Change the password of the logged-in account"""
+        account = self.logged_in_account
         old_pwd = input("Enter old password: ")
-        if hash_password(old_pwd) != self.logged_in_account.password:
+        # Check against the digest cached at login instead of re-running PBKDF2
+        old_digest = session_digest(old_pwd, account.salt)
+        if not hmac.compare_digest(old_digest, account.session_digest):
             print("❌ Incorrect old password.")
             return
         new_pwd = input("Enter new password: ")
-        self.logged_in_account.password = hash_password(new_pwd)
-
-        accounts = self.get_all_accounts()
-        for acc in accounts:
-            if acc.account_no == self.logged_in_account.account_no:
-                acc.password = self.logged_in_account.password
-        self.save_accounts(accounts)
+        account.salt = generate_salt()
+        account.password = hash_password(new_pwd, account.salt)
+        account.session_digest = session_digest(new_pwd, account.salt)
+        self.update_account()
         print("✅ Password changed successfully!")
 
     # ---------- Close Account ----------
@@ -214,9 +368,10 @@ class BankingSystem:
         """Close the logged-in account"""
         confirm = input("Are you sure you want to close your account? (yes/no): ")
         if confirm.lower() == "yes":
-            accounts = self.get_all_accounts()
-            accounts = [acc for acc in accounts if acc.account_no != self.logged_in_account.account_no]
-            self.save_accounts(accounts)
+            self.logged_in_account.session_digest = None
+            del self.accounts[self.logged_in_account.account_no]
+            self.save_accounts(self.accounts.values())
+            flush_transactions()
             print("✅ Account closed successfully.")
             self.logged_in_account = None
 
@@ -224,10 +379,8 @@ class BankingSystem:
     def main_menu(self):
         """Main entry point for users"""
         while True:
-            print("\n===== Banking System =====")
-            print("1. Create Account")
-            print("2. Login")
-            print("3. Exit")
+            sys.stdout.write(MAIN_MENU)
+            sys.stdout.flush()
 
             choice = input("Enter choice: ")
 
@@ -237,6 +390,7 @@ class BankingSystem:
                 if self.login():
                     self.account_menu()
             elif choice == "3":
+                flush_transactions()
                 print("👋 Thank you for using the Banking System.")
                 break
             else:
@@ -246,14 +400,8 @@ class BankingSystem:
     def account_menu(self):
         """Menu after login"""
         while True:
-            print("\n===== Account Menu =====")
-            print("1. Deposit")
-            print("2. Withdraw")
-            print("3. Balance Inquiry")
-            print("4. Fund Transfer")
-            print("5. Change Password")
-            print("6. Close Account")
-            print("7. Logout")
+            sys.stdout.write(ACCOUNT_MENU)
+            sys.stdout.flush()
 
             choice = input("Enter choice: ")
 
@@ -271,6 +419,8 @@ class BankingSystem:
                 self.close_account()
                 break
             elif choice == "7":
+                self.logged_in_account.session_digest = None
+                flush_transactions()
                 print("👋 Logged out.")
                 break
             else: